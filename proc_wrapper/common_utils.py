@@ -1,8 +1,18 @@
+import json
 import logging
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
 
 _logger = logging.getLogger(__name__)
 
+# Shared by all request bodies. Compact separators make bodies smaller, and
+# json.dumps() creates a new encoder on each call when given any options.
+_json_encoder = json.JSONEncoder(separators=(",", ":"))
+
 
 # From glglgl on
 # https://stackoverflow.com/questions/4978738/is-there-a-python-equivalent-of-the-c-sharp-null-coalescing-operator
@@ -51,6 +61,27 @@ def encode_int(x: Optional[int], empty_value: Optional[int] = None) -> Optional[
         return x
 
 
+def encode_json(value: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            # For example, integers larger than 64 bits
+            pass
+
+    return _json_encoder.encode(value).encode("utf-8")
+
+
+def decode_json(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+
+    return json.loads(data)
+
+
 def string_to_float(
     s: Optional[Any],
     default_value: Optional[float] = None,
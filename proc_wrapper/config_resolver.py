@@ -94,7 +94,7 @@ def transform_value(
 
         jsonpath_expr_str = transform_expr_str[len(JSON_PATH_TRANSFORM_PREFIX) :]
 
-        _logger.debug(f"jsonpath_expr_str = '{jsonpath_expr_str}'")
+        _logger.debug("jsonpath_expr_str = '%s'", jsonpath_expr_str)
 
         should_splat = False
         if jsonpath_expr_str.endswith(SPLAT_AFTER_JSON_PATH_SUFFIX):
@@ -114,7 +114,7 @@ def transform_value(
         results = jsonpath_expr.find(parsed_value)
 
         if log_secrets:
-            _logger.debug(f"json path results = {results}")
+            _logger.debug("json path results = %s", results)
 
         results_len = len(results)
 
@@ -161,14 +161,14 @@ class SecretProvider:
         return value.startswith(self.value_prefix)
 
     def cache_key_for_value(self, value: str) -> str:
-        _logger.debug(f"Cache key for input value '{value}'")
+        _logger.debug("Cache key for input value '%s'", value)
 
         value, _format = self.extract_explicit_format(value)
 
         if value.startswith(self.value_prefix):
             value = value[len(self.value_prefix) :]
 
-        _logger.debug(f"Cache key for output value '{value}'")
+        _logger.debug("Cache key for output value '%s'", value)
 
         return value
 
@@ -338,7 +338,7 @@ class AwsSecretsManagerSecretProvider(SecretProvider):
             if self.aws_secrets_manager_client_create_attempted_at:
                 return None
 
-            self.aws_secrets_manager_client_create_attempted_at = time.time()
+            self.aws_secrets_manager_client_create_attempted_at = time.monotonic()
 
             try:
                 import boto3
@@ -398,7 +398,7 @@ class AwsSystemsManagerParameterStoreSecretProvider(SecretProvider):
             if self.aws_ssm_client_create_attempted_at:
                 return None
 
-            self.aws_ssm_client_create_attempted_at = time.time()
+            self.aws_ssm_client_create_attempted_at = time.monotonic()
 
             try:
                 import boto3
@@ -472,7 +472,7 @@ class AwsS3SecretProvider(SecretProvider):
             if self.aws_s3_resource_create_attempted_at:
                 return None
 
-            self.aws_s3_resource_create_attempted_at = time.time()
+            self.aws_s3_resource_create_attempted_at = time.monotonic()
 
             try:
                 import boto3
@@ -536,7 +536,7 @@ class CachedValueEntry(NamedTuple):
         if ttl_seconds is None:
             return False
 
-        return (time.time() - self.fetched_at) > ttl_seconds
+        return (time.monotonic() - self.fetched_at) > ttl_seconds
 
 
 class ResolutionResult(NamedTuple):
@@ -870,7 +870,7 @@ class ConfigResolver:
         """
         if depth == 0:
             target = "environment" if is_env else "configuration"
-            _logger.debug(f"Starting secrets resolution of {target} ...")
+            _logger.debug("Starting secrets resolution of %s ...", target)
         elif depth >= self.params.max_config_resolution_depth:
             _logger.info(f"Reached max depth of {depth}, stopping further resolution")
             return ResolutionResult(
@@ -1129,7 +1129,7 @@ defaulting to plain"""
             cache[cache_key] = CachedValueEntry(
                 string_value=string_value,
                 parsed_value=parsed_value,
-                fetched_at=time.time(),
+                fetched_at=time.monotonic(),
                 is_value_dict=is_value_config_dict,
             )
 
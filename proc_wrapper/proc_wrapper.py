@@ -25,23 +25,46 @@ import atexit
 import json
 import logging
 import math
+import operator
 import os
 import random
+import selectors
 import signal
 import socket
+import struct
 import sys
 import time
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 from http import HTTPStatus
-from io import RawIOBase
+from http.client import (
+    HTTPConnection,
+    HTTPException,
+    HTTPResponse,
+    HTTPSConnection,
+    RemoteDisconnected,
+)
+from io import BytesIO
 from subprocess import Popen, TimeoutExpired
-from typing import Any, Dict, List, Mapping, Optional, Union
+from typing import Any, BinaryIO, Callable, Dict, List, Mapping, Optional, Tuple, Union
 from urllib.error import HTTPError, URLError
-from urllib.parse import quote_plus
-from urllib.request import Request, urlopen
+from urllib.parse import quote_plus, urljoin, urlparse
+from urllib.request import (
+    HTTPRedirectHandler,
+    Request,
+    getproxies,
+    proxy_bypass,
+    urlopen,
+)
 
-from .common_utils import best_effort_deep_merge, coalesce, encode_int, string_to_bool
+from .common_utils import (
+    best_effort_deep_merge,
+    coalesce,
+    decode_json,
+    encode_int,
+    encode_json,
+    string_to_bool,
+)
 from .config_resolver import ConfigResolver
 from .proc_wrapper_params import ProcWrapperParams, ProcWrapperParamValidationErrors
 from .runtime_metadata import (
@@ -56,6 +79,12 @@ _logger.addHandler(logging.NullHandler())
 
 caught_sigterm = False
 
+# Whether the run loop is waiting on the signal wakeup fd
+_waiting_for_wakeup = False
+
+# The local hostname doesn't change, so it is looked up at most once
+_local_hostname: Optional[str] = None
+
 
 def _exit_handler(wrapper: "ProcWrapper"):
     # Prevent re-entrancy and changing of the exit code
@@ -69,6 +98,13 @@ def _exit_handler(wrapper: "ProcWrapper"):
 def _signal_handler(signum, frame):
     global caught_sigterm
     caught_sigterm = True
+
+    # If the run loop is waiting, it has been woken up by the signal wakeup
+    # fd, so let it exit from the main thread outside of the signal handler,
+    # so shutdown doesn't interrupt logging or socket I/O.
+    if _waiting_for_wakeup:
+        return
+
     _logger.info(f"Caught signal {signum}, exiting")
 
     # This will cause the exit handler to be executed, if it is registered.
@@ -76,6 +112,11 @@ def _signal_handler(signum, frame):
     sys.exit(0)
 
 
+def _child_signal_handler(signum, frame):
+    # Only installed so that SIGCHLD is written to the signal wakeup fd
+    pass
+
+
 class ProcWrapper:
     """
     A class that wraps the execution of a process and provides functionality for managing the process,
@@ -135,7 +176,30 @@ class ProcWrapper:
     _MIN_HTTP_REQUEST_DELAY_SECONDS = 5
     _MAX_HTTP_REQUEST_DELAY_SECONDS = 600
 
+    _HTTP_REDIRECT_STATUS_CODES = frozenset([301, 302, 303, 307, 308])
+
+    # Methods that can be resent if the connection is reset before the
+    # response is received
+    _IDEMPOTENT_HTTP_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+    # Same User-Agent that urlopen() sends
+    _HTTP_USER_AGENT = "Python-urllib/%d.%d" % sys.version_info[:2]
+
+    # The status receive buffer is at least one page, and large enough to hold
+    # a maximum size status message in a single datagram, since the part of a
+    # datagram that doesn't fit in the buffer is discarded by recv_into().
     _STATUS_BUFFER_SIZE = 4096
+    _MAX_STATUS_BUFFER_SIZE = 65536
+    _STATUS_LENGTH_PREFIX_SIZE = 4
+
+    # Requested kernel receive buffer size for the status socket, so that
+    # bursts of status messages aren't dropped while the run loop is busy.
+    # The kernel may cap this (for example at net.core.rmem_max on Linux).
+    _STATUS_SOCKET_RECEIVE_BUFFER_SIZE = 1 << 20
+
+    # Forced runtime metadata fetches within this many seconds of the last
+    # fetch reuse its result
+    _MIN_FORCED_RUNTIME_METADATA_REFRESH_INTERVAL = 1.0
 
     _STATUS_UPDATE_KEY_LAST_APP_HEARTBEAT_AT = "last_app_heartbeat_at"
 
@@ -147,6 +211,18 @@ class ProcWrapper:
         "ip_v4_addresses",
     ]
 
+    _get_copied_runtime_metadata_properties = staticmethod(
+        operator.attrgetter(*_COPIED_RUNTIME_METADATA_PROPERTY_NAMES)
+    )
+
+    # Rollbar responses are small, only the item UUID is read from them
+    _MAX_ROLLBAR_RESPONSE_BYTES = 64 * 1024
+
+    # Identical error messages reported within this many seconds are only
+    # sent to Rollbar once, so an outage doesn't send a report per retry
+    _ERROR_REPORT_DEDUPLICATION_SECONDS = 60.0
+    _MAX_RECENT_ERROR_REPORTS = 128
+
     _SEND_RESULT_SUCCESS = 1
     _SEND_RESULT_NON_FATAL_FAILURE = 2
     _SEND_RESULT_SKIPPED = 3
@@ -181,7 +257,8 @@ class ProcWrapper:
         self.skip_start_notification: bool = False
         self.task_uuid: Optional[str] = None
         self.task_name: Optional[str] = None
-        self.task_execution_uuid: Optional[str] = None
+        self._task_execution_uuid: Optional[str] = None
+        self._task_execution_url: Optional[str] = None
         self.was_conflict: bool = False
         self.called_exit: bool = False
         self.reported_final_status: bool = False
@@ -197,12 +274,25 @@ class ProcWrapper:
         self.api_server_retries_exhausted: bool = False
         self.last_api_request_failed_at: Optional[float] = None
         self.last_api_request_data: Optional[Dict[str, Any]] = None
+        # Connections kept open between API and Rollbar requests, keyed by
+        # (scheme, host)
+        self._http_connections: Dict[Tuple[str, str], HTTPConnection] = {}
         self.config_last_reloaded_at: Optional[float] = None
+        # Parts of the Task Execution creation request body, and the request
+        # headers, that only depend on params, cleared when params change
+        self._static_request_bodies: Optional[
+            Tuple[Dict[str, Any], Dict[str, Any]]
+        ] = None
+        self._api_headers: Optional[Dict[str, str]] = None
 
         self.status_dict: Dict[str, Any] = {}
+        self._status_dict_json_suffix: Optional[bytes] = None
         self._status_socket: Optional[socket.socket] = None
         self._status_buffer: Optional[bytearray] = None
         self._status_message_so_far: Optional[bytearray] = None
+        self._discarding_status_message: bool = False
+        # Set when a status message was received while reading the socket
+        self._status_message_received: bool = False
         self.last_update_sent_at: Optional[float] = None
         self.last_app_heartbeat_at: Optional[datetime] = None
         self.runtime_metadata: Optional[RuntimeMetadata] = None
@@ -215,9 +305,26 @@ class ProcWrapper:
         self.failed_config_props: List[str] = []
 
         self.rollbar_retries_exhausted = False
+        self._rollbar_retries_exhausted_at: Optional[float] = None
+        # Error message => when it was last sent to Rollbar, oldest first
+        self._recent_error_reports: Dict[str, float] = {}
         self.exit_handler_installed = False
+        self._log_formatter: Optional[logging.Formatter] = None
+        # Pipe that signal numbers are written to by signal.set_wakeup_fd()
+        self._wakeup_read_fd: Optional[int] = None
+        self._wakeup_write_fd: Optional[int] = None
+        # Restored when the wakeup pipe is closed
+        self._previous_wakeup_fd = -1
+        self._previous_child_signal_handler: Any = signal.SIG_DFL
+        # pidfd of the process, readable once it exits, if supported
+        self._process_fd: Optional[int] = None
         self.in_pytest = string_to_bool(os.environ.get("IN_PYTEST")) or False
 
+        # Called by _exit_or_raise() in wrapped mode. Tests can replace this.
+        self._exit_func: Callable[[int], None] = (
+            self._handle_exit_in_pytest if self.in_pytest else self._exit_process
+        )
+
         if params:
             self.params = params
         else:
@@ -285,6 +392,8 @@ class ProcWrapper:
             # program to exit with an error, triggering the exit handler.
             signal.signal(signal.SIGTERM, _signal_handler)
 
+            self._open_wakeup_pipe()
+
             self.exit_handler_installed = True
 
             _logger.debug("Successfully installed exit handler and signal handler")
@@ -322,7 +431,7 @@ class ProcWrapper:
 
         task_name = self.task_name or self.task_uuid or "[Unnamed]"
         now = datetime.utcnow()
-        now_ts = now.timestamp()
+        now_ts = time.time()
         max_attempts_str = (
             "infinity"
             if self.params.process_max_retries is None
@@ -355,6 +464,32 @@ class ProcWrapper:
 
         return self.params.process_max_retries + 1
 
+    @property
+    def task_execution_uuid(self) -> Optional[str]:
+        return self._task_execution_uuid
+
+    @task_execution_uuid.setter
+    def task_execution_uuid(self, value: Optional[str]) -> None:
+        self._task_execution_uuid = value
+
+        # Invalidate the cached URL, it will be rebuilt on the next request
+        self._task_execution_url = None
+
+    def _make_task_execution_url(self) -> str:
+        """
+        Return the URL of the current Task Execution, which must be set.
+        The URL is cached since the API base URL and the Task Execution UUID
+        do not change once the Task Execution is created.
+        """
+        if self._task_execution_url is None:
+            self._task_execution_url = (
+                f"{self.params.api_base_url}/api/v1/task_executions/"
+                + quote_plus(str(self._task_execution_uuid))
+                + "/"
+            )
+
+        return self._task_execution_url
+
     def update_status(
         self,
         success_count: Optional[int] = None,
@@ -386,21 +521,25 @@ class ProcWrapper:
     def _fetch_runtime_metadata_if_necessary(
         self, force: bool = False
     ) -> Optional[RuntimeMetadata]:
-        current_time = time.time()
-        if (
-            (not force)
-            and self.runtime_metadata
-            and self.runtime_metadata_last_refreshed_at
-            and (
-                (self.refresh_runtime_metadata_interval is None)
-                or (self.refresh_runtime_metadata_interval < 0)
-                or (
-                    current_time - self.runtime_metadata_last_refreshed_at
-                    <= self.refresh_runtime_metadata_interval
+        current_time = time.monotonic()
+        if self.runtime_metadata and self.runtime_metadata_last_refreshed_at:
+            elapsed_time = current_time - self.runtime_metadata_last_refreshed_at
+
+            if force:
+                # Don't refetch right after a fetch, unless the execution
+                # status depends on the latest runtime metadata.
+                use_cached = (not self.is_execution_status_from_runtime_metadata) and (
+                    elapsed_time < self._MIN_FORCED_RUNTIME_METADATA_REFRESH_INTERVAL
+                )
+            else:
+                use_cached = (
+                    (self.refresh_runtime_metadata_interval is None)
+                    or (self.refresh_runtime_metadata_interval < 0)
+                    or (elapsed_time <= self.refresh_runtime_metadata_interval)
                 )
-            )
-        ):
-            return self.runtime_metadata
+
+            if use_cached:
+                return self.runtime_metadata
 
         runtime_metadata: Optional[RuntimeMetadata] = None
 
@@ -463,11 +602,12 @@ class ProcWrapper:
         if infra_settings:
             dest["infrastructure_settings"] = infra_settings
 
-        for p in self._COPIED_RUNTIME_METADATA_PROPERTY_NAMES:
-            x = None
-            if rm_config:
-                x = getattr(rm_config, p)
+        if rm_config:
+            values = self._get_copied_runtime_metadata_properties(rm_config)
+        else:
+            values = (None,) * len(self._COPIED_RUNTIME_METADATA_PROPERTY_NAMES)
 
+        for p, x in zip(self._COPIED_RUNTIME_METADATA_PROPERTY_NAMES, values):
             if override_props:
                 x = coalesce(override_props.get(p), x)
 
@@ -477,6 +617,8 @@ class ProcWrapper:
         return dest
 
     def _compute_hostname(self) -> Optional[str]:
+        global _local_hostname
+
         rm = self.runtime_metadata
 
         if rm and (rm.host_addresses or rm.host_names):
@@ -484,11 +626,14 @@ class ProcWrapper:
 
         if self.hostname is None:
             try:
-                self.hostname = socket.gethostname()
+                if _local_hostname is None:
+                    _local_hostname = socket.gethostname()
+
+                self.hostname = _local_hostname
             except Exception:
                 _logger.warning("Can't get hostname", exc_info=True)
 
-        _logger.debug(f"Hostname = '{self.hostname}'")
+        _logger.debug("Hostname = '%s'", self.hostname)
 
         return self.hostname
 
@@ -506,6 +651,81 @@ class ProcWrapper:
         else:
             return "127.0.0.1"
 
+    def _make_static_request_bodies(
+        self,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Return the properties of Task Execution creation requests that only
+        depend on params, as a tuple of the properties shared with the Task
+        and the properties of the Task Execution.
+        """
+        p = self.params
+
+        common_body = {
+            "is_service": p.service,
+            "schedule": p.schedule or "",
+            "heartbeat_interval_seconds": encode_int(
+                p.api_heartbeat_interval, empty_value=-1
+            ),
+            "api_managed_probability": p.api_managed_probability,
+            "api_failure_report_probability": p.api_failure_report_probability,
+            "api_timeout_report_probability": p.api_timeout_report_probability,
+        }
+
+        body = {
+            "task_version_number": p.task_version_number,
+            "task_version_text": p.task_version_text,
+            "task_version_signature": p.task_version_signature,
+            "process_timeout_seconds": p.process_timeout,
+            "process_max_retries": encode_int(p.process_max_retries, empty_value=-1),
+            "process_retry_delay_seconds": p.process_retry_delay,
+            "task_max_concurrency": p.max_concurrency,
+            "max_conflicting_age_seconds": p.max_conflicting_age,
+            "prevent_offline_execution": p.prevent_offline_execution,
+            "process_termination_grace_period_seconds": p.process_termination_grace_period,
+            "wrapper_family": ProcWrapper.WRAPPER_FAMILY,
+            "wrapper_version": ProcWrapper.VERSION,
+            "api_error_timeout_seconds": encode_int(
+                p.api_error_timeout, empty_value=-1
+            ),
+            "api_retry_delay_seconds": encode_int(p.api_retry_delay),
+            "api_resume_delay_seconds": encode_int(p.api_resume_delay),
+            "api_task_execution_creation_error_timeout_seconds": encode_int(
+                p.api_task_execution_creation_error_timeout,
+                empty_value=-1,
+            ),
+            "api_task_execution_creation_conflict_timeout_seconds": encode_int(
+                p.api_task_execution_creation_conflict_timeout,
+                empty_value=-1,
+            ),
+            "api_task_execution_creation_conflict_retry_delay_seconds": encode_int(
+                p.api_task_execution_creation_conflict_retry_delay
+            ),
+            "api_final_update_timeout_seconds": encode_int(
+                p.api_final_update_timeout, empty_value=-1
+            ),
+            "api_request_timeout_seconds": encode_int(
+                p.api_request_timeout, empty_value=-1
+            ),
+            "status_update_interval_seconds": encode_int(
+                p.status_update_interval, empty_value=-1
+            ),
+            "status_update_port": encode_int(
+                p.status_update_socket_port, empty_value=-1
+            ),
+            "status_update_message_max_bytes": encode_int(
+                p.status_update_message_max_bytes, empty_value=-1
+            ),
+            "embedded_mode": p.embedded_mode,
+        }
+
+        body.update(common_body)
+
+        if p.command:
+            body["process_command"] = " ".join(p.command)
+
+        return (common_body, body)
+
     def _create_or_update_task_execution(
         self,
         status: Optional[str] = None,
@@ -528,6 +748,7 @@ class ProcWrapper:
         if self.offline_mode:
             return self._SEND_RESULT_SKIPPED
 
+        p = self.params
         status = status or ProcWrapper.STATUS_RUNNING
         stop_reason: Optional[str] = None
 
@@ -547,92 +768,43 @@ class ProcWrapper:
             if is_running or (status == ProcWrapper.STATUS_SUCCEEDED):
                 should_send = not self.skip_start_notification
             elif status == ProcWrapper.STATUS_TERMINATED_AFTER_TIME_OUT:
-                should_send = (self.params.api_timeout_report_probability >= 1.0) or (
-                    random.random() < self.params.api_timeout_report_probability
+                should_send = (p.api_timeout_report_probability >= 1.0) or (
+                    random.random() < p.api_timeout_report_probability
                 )
             else:
-                should_send = (self.params.api_failure_report_probability >= 1.0) or (
-                    random.random() < self.params.api_failure_report_probability
+                should_send = (p.api_failure_report_probability >= 1.0) or (
+                    random.random() < p.api_failure_report_probability
                 )
 
         if not should_send:
             _logger.info("Skipping Task Execution creation")
             return self._SEND_RESULT_SKIPPED
 
-        need_hostname = self.params.send_hostname and (self.hostname is None)
+        need_hostname = p.send_hostname and (self.hostname is None)
 
-        if self.params.send_runtime_metadata or need_hostname:
+        if p.send_runtime_metadata or need_hostname:
             self._fetch_runtime_metadata_if_necessary(force=not is_running)
 
         if need_hostname:
             self._compute_hostname()
 
         try:
-            url = f"{self.params.api_base_url}/api/v1/task_executions/"
+            url = f"{p.api_base_url}/api/v1/task_executions/"
             http_method = "POST"
             headers = self._make_headers()
 
-            common_body = {
-                "is_service": self.params.service,
-                "schedule": self.params.schedule or "",
-                "heartbeat_interval_seconds": encode_int(
-                    self.params.api_heartbeat_interval, empty_value=-1
-                ),
-                "api_managed_probability": self.params.api_managed_probability,
-                "api_failure_report_probability": self.params.api_failure_report_probability,
-                "api_timeout_report_probability": self.params.api_timeout_report_probability,
-            }
+            static_bodies = self._static_request_bodies
+            if static_bodies is None:
+                static_bodies = self._make_static_request_bodies()
+                self._static_request_bodies = static_bodies
+
+            common_body, static_body = static_bodies
 
             body = {
                 "status": status,
-                "task_version_number": self.params.task_version_number,
-                "task_version_text": self.params.task_version_text,
-                "task_version_signature": self.params.task_version_signature,
-                "process_timeout_seconds": self.params.process_timeout,
-                "process_max_retries": encode_int(
-                    self.params.process_max_retries, empty_value=-1
-                ),
-                "process_retry_delay_seconds": self.params.process_retry_delay,
-                "task_max_concurrency": self.params.max_concurrency,
-                "max_conflicting_age_seconds": self.params.max_conflicting_age,
-                "prevent_offline_execution": self.params.prevent_offline_execution,
-                "process_termination_grace_period_seconds": self.params.process_termination_grace_period,
                 "wrapper_log_level": logging.getLevelName(_logger.getEffectiveLevel()),
-                "wrapper_family": ProcWrapper.WRAPPER_FAMILY,
-                "wrapper_version": ProcWrapper.VERSION,
-                "api_error_timeout_seconds": encode_int(
-                    self.params.api_error_timeout, empty_value=-1
-                ),
-                "api_retry_delay_seconds": encode_int(self.params.api_retry_delay),
-                "api_resume_delay_seconds": encode_int(self.params.api_resume_delay),
-                "api_task_execution_creation_error_timeout_seconds": encode_int(
-                    self.params.api_task_execution_creation_error_timeout,
-                    empty_value=-1,
-                ),
-                "api_task_execution_creation_conflict_timeout_seconds": encode_int(
-                    self.params.api_task_execution_creation_conflict_timeout,
-                    empty_value=-1,
-                ),
-                "api_task_execution_creation_conflict_retry_delay_seconds": encode_int(
-                    self.params.api_task_execution_creation_conflict_retry_delay
-                ),
-                "api_final_update_timeout_seconds": encode_int(
-                    self.params.api_final_update_timeout, empty_value=-1
-                ),
-                "api_request_timeout_seconds": encode_int(
-                    self.params.api_request_timeout, empty_value=-1
-                ),
-                "status_update_interval_seconds": encode_int(
-                    self.params.status_update_interval, empty_value=-1
-                ),
-                "status_update_port": encode_int(
-                    self.params.status_update_socket_port, empty_value=-1
-                ),
-                "status_update_message_max_bytes": encode_int(
-                    self.params.status_update_message_max_bytes, empty_value=-1
-                ),
-                "embedded_mode": self.params.embedded_mode,
             }
+            body.update(static_body)
 
             # If we are creating or updating a Task Execution after skipping the initial
             # notification, include the post-execution properties
@@ -655,32 +827,28 @@ class ProcWrapper:
                     )
                 )
 
-            if self.params.build_task_execution_uuid:
+            if p.build_task_execution_uuid:
                 body["build"] = {
-                    "task_execution": {"uuid": self.params.build_task_execution_uuid}
+                    "task_execution": {"uuid": p.build_task_execution_uuid}
                 }
 
-            if self.params.deployment_task_execution_uuid:
+            if p.deployment_task_execution_uuid:
                 body["deploy"] = {
-                    "task_execution": {
-                        "uuid": self.params.deployment_task_execution_uuid
-                    }
+                    "task_execution": {"uuid": p.deployment_task_execution_uuid}
                 }
 
-            body.update(common_body)
-
             if stop_reason is not None:
                 body["stop_reason"] = stop_reason
 
-            rm = self.runtime_metadata if self.params.send_runtime_metadata else None
+            rm = self.runtime_metadata if p.send_runtime_metadata else None
 
             if self.task_execution_uuid:
                 # Manually started
-                url += quote_plus(self.task_execution_uuid) + "/"
+                url = self._make_task_execution_url()
                 http_method = "PATCH"
             else:
-                if self.params.auto_create_task_props:
-                    task_dict = self.params.auto_create_task_props.copy()
+                if p.auto_create_task_props:
+                    task_dict = p.auto_create_task_props.copy()
                     task_dict.update(common_body)
                 else:
                     task_dict = common_body.copy()
@@ -696,58 +864,51 @@ class ProcWrapper:
                 task_dict.update(
                     {
                         "max_concurrency": encode_int(
-                            self.params.max_concurrency, empty_value=-1
+                            p.max_concurrency, empty_value=-1
                         ),
-                        "was_auto_created": self.params.auto_create_task,
-                        "passive": self.params.task_is_passive,
+                        "was_auto_created": p.auto_create_task,
+                        "passive": p.task_is_passive,
                     }
                 )
 
                 run_env_dict = {}
 
-                if self.params.auto_create_task_run_environment_name:
-                    run_env_dict[
-                        "name"
-                    ] = self.params.auto_create_task_run_environment_name
+                if p.auto_create_task_run_environment_name:
+                    run_env_dict["name"] = p.auto_create_task_run_environment_name
 
-                if self.params.auto_create_task_run_environment_uuid:
-                    run_env_dict[
-                        "uuid"
-                    ] = self.params.auto_create_task_run_environment_uuid
+                if p.auto_create_task_run_environment_uuid:
+                    run_env_dict["uuid"] = p.auto_create_task_run_environment_uuid
 
                 task_dict["run_environment"] = run_env_dict
 
                 self._transfer_runtime_metadata(
                     dest=task_dict,
                     runtime_metadata=rm,
-                    override_props=self.params.auto_create_task_props,
+                    override_props=p.auto_create_task_props,
                     for_task=True,
                 )
 
                 body["task"] = task_dict
-                body["max_conflicting_age_seconds"] = self.params.max_conflicting_age
+                body["max_conflicting_age_seconds"] = p.max_conflicting_age
 
-            if self.params.command:
-                body["process_command"] = " ".join(self.params.command)
-
-            if self.params.send_hostname and self.hostname:
+            if p.send_hostname and self.hostname:
                 body["hostname"] = self.hostname
 
-            if self.params.task_instance_metadata:
-                body["other_instance_metadata"] = self.params.task_instance_metadata
+            if p.task_instance_metadata:
+                body["other_instance_metadata"] = p.task_instance_metadata
 
             self._transfer_runtime_metadata(
                 dest=body,
                 runtime_metadata=rm,
                 override_props={
                     # TODO
-                    # "execution_method_type": self.params.execution_method_type,
-                    "execution_method_details": self.params.execution_method_props
+                    # "execution_method_type": p.execution_method_type,
+                    "execution_method_details": p.execution_method_props
                 },
                 for_task=False,
             )
 
-            data = json.dumps(body).encode("utf-8")
+            data = encode_json(body)
 
             req = Request(url, data=data, headers=headers, method=http_method)
 
@@ -771,10 +932,12 @@ class ProcWrapper:
                         "Unexpected None result of reading Task Execution creation response"
                     )
 
-                response_body = fd.decode("utf-8")
-                _logger.debug(f"Got creation response '{response_body}'")
+                if _logger.isEnabledFor(logging.DEBUG):
+                    _logger.debug(
+                        "Got creation response '%s'", fd.decode("utf-8", "replace")
+                    )
 
-                response_dict = json.loads(response_body)
+                response_dict = decode_json(fd)
 
                 _logger.info("Task Execution creation request was successful.")
 
@@ -782,7 +945,7 @@ class ProcWrapper:
                     self.reported_final_status = True
 
                 if rm:
-                    self.runtime_metadata_last_sent_at = time.time()
+                    self.runtime_metadata_last_sent_at = time.monotonic()
 
                 if not self.task_execution_uuid:
                     self.task_execution_uuid = response_dict.get("uuid")
@@ -796,7 +959,7 @@ class ProcWrapper:
             _logger.exception(
                 "_create_or_update_task_execution() failed with exception"
             )
-            if self.params.prevent_offline_execution:
+            if p.prevent_offline_execution:
                 raise ex
 
             _logger.info("Not preventing offline execution, so continuing")
@@ -824,7 +987,7 @@ class ProcWrapper:
         Return a _STATUS_XXX constant indicating the result of the update.
         """
 
-        _logger.debug(f"_update_status(), is_app_update = {is_app_update}")
+        _logger.debug("_update_status(), is_app_update = %s", is_app_update)
 
         if is_app_update:
             self.last_app_heartbeat_at = last_app_heartbeat_at or datetime.utcnow()
@@ -855,6 +1018,8 @@ class ProcWrapper:
         if extra_status_props:
             self.status_dict.update(extra_status_props)
 
+        self._status_dict_json_suffix = None
+
         if self.skip_start_notification:
             should_send = False
         # These are important updates that should be sent as long as we are notifying the API
@@ -1037,6 +1202,10 @@ class ProcWrapper:
             if config_override:
                 self.resolved_config.update(config_override)
 
+        self._static_request_bodies = None
+        self._api_headers = None
+        self._task_execution_url = None
+
     def _reload_params(self) -> None:
         (
             self.resolved_env,
@@ -1057,8 +1226,11 @@ class ProcWrapper:
         self.param_errors = self.params.sanitize_and_validate(
             runtime_metadata=self.runtime_metadata
         )
+        self._static_request_bodies = None
+        self._api_headers = None
+        self._task_execution_url = None
 
-        self.config_last_reloaded_at = time.time()
+        self.config_last_reloaded_at = time.monotonic()
 
     def _setup_task_execution(self) -> bool:
         self.task_uuid = self.params.task_uuid
@@ -1141,7 +1313,7 @@ class ProcWrapper:
             self.attempt_count += 1
             self.timed_out = False
 
-            current_time = time.time()
+            current_time = time.monotonic()
 
             process_finish_deadline = math.inf
             if self.params.process_timeout:
@@ -1157,7 +1329,12 @@ class ProcWrapper:
                     current_time + self.params.process_check_interval
                 )
 
-            latest_attempt_started_at = current_time
+            # Status received while an update was not due is kept in
+            # status_dict, and sent once an update is due.
+            last_status_flush_attempted_at = -math.inf
+
+            # Wall clock time, for reporting by print_final_status()
+            latest_attempt_started_at = time.time()
             if first_attempt_started_at is None:
                 first_attempt_started_at = latest_attempt_started_at
 
@@ -1175,9 +1352,12 @@ class ProcWrapper:
 
             done_polling = False
             while not done_polling:
+                # Params may be reloaded at the end of each iteration
+                params = self.params
+
                 self._read_from_status_socket()
 
-                current_time = time.time()
+                current_time = time.monotonic()
 
                 if command and self.process and (monitor_process_exit_code is None):
                     monitor_process_exit_code = self.process.poll()
@@ -1204,63 +1384,86 @@ class ProcWrapper:
 
                         if self.process:
                             _logger.warning(
-                                f"Process timed out after {self.params.process_timeout} seconds, sending SIGTERM ..."
+                                f"Process timed out after {params.process_timeout} seconds, sending SIGTERM ..."
                             )
                             self._terminate_or_kill_process()
                     else:
-                        if (self.params.process_check_interval is not None) and (
+                        if (params.process_check_interval is not None) and (
                             current_time >= next_process_check_time
                         ):
                             next_process_check_time = (
-                                current_time + self.params.process_check_interval
+                                current_time + params.process_check_interval
                             )
 
                         next_runtime_metadata_refresh_time = math.inf
-                        if self.refresh_runtime_metadata_interval and (
-                            self.refresh_runtime_metadata_interval > 0
-                        ):
+                        refresh_interval = self.refresh_runtime_metadata_interval
+                        if refresh_interval and (refresh_interval > 0):
                             next_runtime_metadata_refresh_time = (
                                 self.runtime_metadata_last_refreshed_at or current_time
-                            ) + self.refresh_runtime_metadata_interval
+                            ) + refresh_interval
+
+                        # Zero or negative intervals mean status is only sent
+                        # with heartbeats, or as soon as it is received
+                        next_status_update_time = math.inf
+                        status_update_interval = params.status_update_interval
+                        if (
+                            self.status_dict
+                            and (status_update_interval is not None)
+                            and (status_update_interval > 0)
+                        ):
+                            next_status_update_time = (
+                                self._compute_next_status_flush_time(
+                                    status_update_interval,
+                                    last_status_flush_attempted_at,
+                                )
+                            )
 
-                        if self.params.api_heartbeat_interval:
+                            if current_time >= next_status_update_time:
+                                last_status_flush_attempted_at = current_time
+                                self.send_update()
+                                current_time = time.monotonic()
+                                next_status_update_time = (
+                                    self._compute_next_status_flush_time(
+                                        status_update_interval,
+                                        last_status_flush_attempted_at,
+                                    )
+                                    if self.status_dict
+                                    else math.inf
+                                )
+
+                        if params.api_heartbeat_interval:
                             if self.last_update_sent_at is not None:
                                 next_heartbeat_time = max(
                                     next_heartbeat_time,
                                     self.last_update_sent_at
-                                    + self.params.api_heartbeat_interval,
+                                    + params.api_heartbeat_interval,
                                 )
 
                             if current_time >= next_heartbeat_time:
                                 self.send_update()
-                                current_time = time.time()
+                                current_time = time.monotonic()
                                 next_heartbeat_time = (
-                                    current_time + self.params.api_heartbeat_interval
+                                    current_time + params.api_heartbeat_interval
                                 )
 
+                        # All deadlines are math.inf when unset
                         sleep_until = min(
-                            process_finish_deadline or math.inf,
-                            next_heartbeat_time or math.inf,
+                            process_finish_deadline,
+                            next_heartbeat_time,
                             next_process_check_time,
                             next_runtime_metadata_refresh_time,
+                            next_status_update_time,
                         )
 
                         sleep_duration = sleep_until - current_time
 
                         if sleep_duration > 0:
                             _logger.debug(
-                                f"Waiting {round(sleep_duration)} seconds while process is running ..."
+                                "Waiting %.0f seconds while process is running ...",
+                                sleep_duration,
                             )
 
-                            if self.process:
-                                try:
-                                    self.process.wait(sleep_duration)
-                                except TimeoutExpired:
-                                    _logger.debug(
-                                        "Done waiting while process is running."
-                                    )
-                            else:
-                                time.sleep(sleep_duration)
+                            self._wait_for_process(sleep_duration)
 
                 else:
                     _logger.info(f"Process exited with exit code {exit_code}")
@@ -1298,7 +1501,8 @@ class ProcWrapper:
 
                     if command and self.params.process_retry_delay:
                         _logger.debug(
-                            f"Sleeping {self.params.process_retry_delay} seconds after monitor process exited ..."
+                            "Sleeping %s seconds after monitor process exited ...",
+                            self.params.process_retry_delay,
                         )
                         time.sleep(self.params.process_retry_delay)
                         _logger.debug("Done sleeping after monitor process exited.")
@@ -1342,7 +1546,9 @@ class ProcWrapper:
         return 0
 
     def handle_exit(self) -> None:
-        _logger.debug(f"Exit handler, Task Execution UUID = {self.task_execution_uuid}")
+        _logger.debug(
+            "Exit handler, Task Execution UUID = %s", self.task_execution_uuid
+        )
 
         if self.called_exit:
             _logger.debug("Called exit already, returning early")
@@ -1360,8 +1566,11 @@ class ProcWrapper:
             self.offline_mode or self.skip_start_notification
         )
 
-        print(
-            f"{error_notification_required=}, {self.skip_start_notification=}, {self.reported_final_status=}"
+        _logger.debug(
+            "error_notification_required = %s, skip_start_notification = %s, reported_final_status = %s",
+            error_notification_required,
+            self.skip_start_notification,
+            self.reported_final_status,
         )
 
         runtime_metadata = self._fetch_runtime_metadata_if_necessary(
@@ -1420,6 +1629,8 @@ class ProcWrapper:
             _logger.exception("Exception in final update")
         finally:
             self._close_status_socket()
+            self._close_http_connections()
+            self._close_wakeup_pipe()
 
         if error_notification_required:
             error_message = "API Server not configured"
@@ -1487,7 +1698,7 @@ class ProcWrapper:
         if self.process_env is None:
             self.process_env = self.make_process_env()
             if self.process_env and self.params.log_secrets:
-                _logger.debug(f"process_env={self.process_env}")
+                _logger.debug("process_env=%s", self.process_env)
 
         # Set the session ID so we can kill the process as a group, so we kill
         # all subprocesses. See https://stackoverflow.com/questions/4789837/how-to-terminate-a-python-subprocess-launched-with-shell-true
@@ -1511,6 +1722,8 @@ class ProcWrapper:
         pid = self.process.pid
         _logger.info(f"pid = {pid}")
 
+        self._open_process_fd(pid)
+
         if (
             pid
             and self.params.send_pid
@@ -1518,13 +1731,194 @@ class ProcWrapper:
         ):
             self._update_status(pid=pid)
 
+    def _open_wakeup_pipe(self) -> None:
+        # select() doesn't support pipes on Windows
+        if os.name != "posix":
+            return
+
+        try:
+            read_fd, write_fd = os.pipe()
+        except OSError:
+            _logger.warning("Can't create signal wakeup pipe", exc_info=True)
+            return
+
+        try:
+            os.set_blocking(read_fd, False)
+            os.set_blocking(write_fd, False)
+            previous_wakeup_fd = signal.set_wakeup_fd(
+                write_fd, warn_on_full_buffer=False
+            )
+        except (OSError, ValueError):
+            _logger.warning("Can't install signal wakeup pipe", exc_info=True)
+            os.close(read_fd)
+            os.close(write_fd)
+            return
+
+        try:
+            # Wake up when any child process exits, even without a pidfd
+            previous_child_signal_handler = signal.signal(
+                signal.SIGCHLD, _child_signal_handler
+            )
+        except (OSError, ValueError):
+            _logger.warning("Can't install SIGCHLD handler", exc_info=True)
+
+            try:
+                signal.set_wakeup_fd(previous_wakeup_fd)
+            except (OSError, ValueError):
+                _logger.debug("Can't restore signal wakeup fd", exc_info=True)
+
+            os.close(read_fd)
+            os.close(write_fd)
+            return
+
+        self._wakeup_read_fd = read_fd
+        self._wakeup_write_fd = write_fd
+        self._previous_wakeup_fd = previous_wakeup_fd
+
+        # None means the handler wasn't installed from Python, and can't be
+        # restored
+        if previous_child_signal_handler is None:
+            self._previous_child_signal_handler = signal.SIG_DFL
+        else:
+            self._previous_child_signal_handler = previous_child_signal_handler
+
+    def _close_wakeup_pipe(self) -> None:
+        if self._wakeup_read_fd is None:
+            return
+
+        try:
+            signal.set_wakeup_fd(self._previous_wakeup_fd)
+            signal.signal(signal.SIGCHLD, self._previous_child_signal_handler)
+        except (OSError, ValueError):
+            _logger.debug("Can't uninstall signal wakeup pipe", exc_info=True)
+
+        for fd in (self._wakeup_read_fd, self._wakeup_write_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+        self._wakeup_read_fd = None
+        self._wakeup_write_fd = None
+
+    def _open_process_fd(self, pid: int) -> None:
+        self._close_process_fd()
+
+        # Only useful when waiting with select()
+        if self._wakeup_read_fd is None:
+            return
+
+        # Available in python 3.9+, on Linux 5.3+
+        pidfd_open = getattr(os, "pidfd_open", None)
+
+        if pidfd_open is None:
+            return
+
+        try:
+            self._process_fd = pidfd_open(pid)
+        except OSError:
+            _logger.debug("Can't open pidfd, waiting for SIGCHLD instead")
+
+    def _close_process_fd(self) -> None:
+        if self._process_fd is not None:
+            try:
+                os.close(self._process_fd)
+            except OSError:
+                pass
+
+            self._process_fd = None
+
+    def _wait_for_process(self, timeout: float) -> None:
+        """
+        Wait up to timeout seconds for the process to exit, or for a status
+        message to arrive. If a signal is caught while waiting, exit from here
+        instead of the signal handler.
+        """
+        global _waiting_for_wakeup
+
+        read_fd = self._wakeup_read_fd
+
+        if read_fd is None:
+            if self.process:
+                try:
+                    self.process.wait(timeout)
+                except TimeoutExpired:
+                    _logger.debug("Done waiting while process is running.")
+            else:
+                time.sleep(timeout)
+            return
+
+        # A selector isn't limited to file descriptors below FD_SETSIZE like
+        # select() is, and uses epoll or kqueue where available.
+        with selectors.DefaultSelector() as selector:
+            selector.register(read_fd, selectors.EVENT_READ)
+
+            if self._status_socket:
+                selector.register(self._status_socket, selectors.EVENT_READ)
+
+            if self.process and (self._process_fd is not None):
+                selector.register(self._process_fd, selectors.EVENT_READ)
+
+            deadline = time.monotonic() + timeout
+
+            # SIGCHLD for a process that exited after the caller last checked
+            # it is still in the wakeup pipe, so select() returns immediately.
+            _waiting_for_wakeup = True
+            try:
+                while not caught_sigterm:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+
+                    events = selector.select(remaining)
+
+                    if any(key.fd == read_fd for key, _ in events):
+                        try:
+                            signal_numbers = os.read(read_fd, 64)
+                        except OSError:
+                            signal_numbers = b""
+
+                        if signal.SIGCHLD in signal_numbers:
+                            # A child process exited, let the caller check
+                            break
+                    elif events:
+                        # The process exited or a status message arrived
+                        break
+            finally:
+                _waiting_for_wakeup = False
+
+        # The signal handler doesn't exit while the flag is set, so check for
+        # a signal on every return, including one that arrived together with
+        # the process exit.
+        if caught_sigterm:
+            _logger.info("Caught signal, exiting")
+            sys.exit(0)
+
     def _open_status_socket(self) -> Optional[socket.socket]:
-        self._status_buffer = bytearray(self._STATUS_BUFFER_SIZE)
+        self._status_buffer = bytearray(self._compute_status_buffer_size())
         self._status_message_so_far = bytearray()
+        self._discarding_status_message = False
 
         try:
             _logger.info("Opening status update socket ...")
             self._status_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+            try:
+                self._status_socket.setsockopt(
+                    socket.SOL_SOCKET,
+                    socket.SO_RCVBUF,
+                    self._STATUS_SOCKET_RECEIVE_BUFFER_SIZE,
+                )
+                _logger.debug(
+                    "Status socket receive buffer size = %d",
+                    self._status_socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF),
+                )
+            except OSError:
+                _logger.debug(
+                    "Can't set status socket receive buffer size", exc_info=True
+                )
+
             status_update_host = self._compute_status_update_host()
             self._status_socket.bind(
                 (status_update_host, self.params.status_update_socket_port)
@@ -1537,46 +1931,122 @@ class ProcWrapper:
             self._close_status_socket()
             return None
 
+    def _compute_status_buffer_size(self) -> int:
+        # Round up to a whole number of pages, leaving room for the trailing
+        # newline or length prefix
+        page_count = -(
+            -(
+                self.params.status_update_message_max_bytes
+                + self._STATUS_LENGTH_PREFIX_SIZE
+            )
+            // self._STATUS_BUFFER_SIZE
+        )
+
+        return min(
+            max(page_count, 1) * self._STATUS_BUFFER_SIZE,
+            self._MAX_STATUS_BUFFER_SIZE,
+        )
+
     def _read_from_status_socket(self):
         if self._status_socket is None:
             return
 
+        self._status_message_received = False
+
         nbytes = 1
         while nbytes > 0:
             try:
                 nbytes = self._status_socket.recv_into(self._status_buffer)
             except OSError:
                 # Happens when there is no data to be read, since the socket is non-blocking
-                return
+                break
+
+            if self.params.status_update_length_prefixed:
+                self._read_length_prefixed_status_messages(nbytes)
+                continue
 
             start_index = 0
             end_index = 0
 
-            while (end_index >= 0) and (start_index < nbytes):
-                end_index = self._status_buffer.find(b"\n", start_index, nbytes)
+            # Copy message fragments out of the receive buffer through a view,
+            # to avoid creating an intermediate bytearray for each fragment.
+            # The view must be released before the next recv_into().
+            with memoryview(self._status_buffer) as view:
+                while (end_index >= 0) and (start_index < nbytes):
+                    end_index = self._status_buffer.find(b"\n", start_index, nbytes)
+
+                    end_index_for_copy = end_index
+                    if end_index < 0:
+                        end_index_for_copy = nbytes
+
+                    bytes_to_copy = end_index_for_copy - start_index
+                    if self._discarding_status_message:
+                        # Skip the rest of an oversized message, up to the
+                        # next newline.
+                        if end_index >= 0:
+                            self._discarding_status_message = False
+                    elif (
+                        len(self._status_message_so_far) + bytes_to_copy
+                        > self.params.status_update_message_max_bytes
+                    ):
+                        _logger.warning(
+                            "Discarding status message which exceeded maximum size of %d bytes",
+                            self.params.status_update_message_max_bytes,
+                        )
 
-                end_index_for_copy = end_index
-                if end_index < 0:
-                    end_index_for_copy = nbytes
+                        # Replace the partial message, instead of clearing it,
+                        # to release the memory it reserved.
+                        self._status_message_so_far = bytearray()
+                        self._discarding_status_message = end_index < 0
+                    else:
+                        self._status_message_so_far.extend(
+                            view[start_index:end_index_for_copy]
+                        )
+                        if end_index >= 0:
+                            self._handle_status_message_complete()
 
-                bytes_to_copy = end_index_for_copy - start_index
-                if (
-                    len(self._status_buffer) + bytes_to_copy
-                    > self.params.status_update_message_max_bytes
-                ):
+                    if end_index >= 0:
+                        start_index = end_index + 1
+
+        # Send at most one update after draining the socket, so that a burst
+        # of status messages is coalesced into a single request.
+        if self._status_message_received:
+            self._status_message_received = False
+
+            if self.is_status_update_due():
+                self.send_update()
+
+    def _read_length_prefixed_status_messages(self, nbytes: int) -> None:
+        """
+        Handle the messages in a datagram, each of which is prefixed by
+        its length as a 4-byte big-endian unsigned integer. Since datagrams
+        are delivered whole, messages never span datagrams.
+        """
+        start_index = 0
+        with memoryview(self._status_buffer) as view:
+            while start_index + self._STATUS_LENGTH_PREFIX_SIZE <= nbytes:
+                (message_length,) = struct.unpack_from(
+                    ">I", self._status_buffer, start_index
+                )
+                start_index += self._STATUS_LENGTH_PREFIX_SIZE
+                end_index = start_index + message_length
+
+                if message_length > self.params.status_update_message_max_bytes:
                     _logger.warning(
-                        f"Discarding status message which exceeded maximum size: {self._status_buffer}"
+                        "Discarding status message which exceeded maximum size of %d bytes",
+                        self.params.status_update_message_max_bytes,
                     )
-                    self._status_buffer.clear()
-                else:
-                    self._status_message_so_far.extend(
-                        self._status_buffer[start_index:end_index_for_copy]
+                    return
+
+                if end_index > nbytes:
+                    _logger.debug(
+                        "Discarding truncated status message of %d bytes",
+                        message_length,
                     )
-                    if end_index >= 0:
-                        self._handle_status_message_complete()
+                    return
 
-                if end_index >= 0:
-                    start_index = end_index + 1
+                self._handle_status_message(view[start_index:end_index])
+                start_index = end_index
 
     def _close_status_socket(self):
         if self._status_socket:
@@ -1589,41 +2059,78 @@ class ProcWrapper:
 
     def _handle_status_message_complete(self):
         try:
-            message = self._status_message_so_far.decode("utf-8")
-
-            _logger.debug(f"Got status message '{message}'")
+            self._handle_status_message(self._status_message_so_far)
+        finally:
+            self._status_message_so_far.clear()
 
-            try:
-                self.status_dict.update(json.loads(message))
+    def _handle_status_message(self, data: Union[bytearray, memoryview]) -> None:
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug(
+                "Got status message '%s'", bytes(data).decode("utf-8", "replace")
+            )
 
-                if self.is_status_update_due():
-                    self.send_update()
-            except json.JSONDecodeError:
-                _logger.debug(
-                    "Error decoding JSON, this can happen due to missing or out of order messages"
-                )
+        # Parse the bytes directly, without decoding them to a string first
+        try:
+            props = decode_json(data)
         except UnicodeDecodeError:
             _logger.debug(
                 "Error decoding message as UTF-8, this can happen due to missing or out of order messages"
             )
-        finally:
-            self._status_message_so_far.clear()
+            return
+        except json.JSONDecodeError:
+            _logger.debug(
+                "Error decoding JSON, this can happen due to missing or out of order messages"
+            )
+            return
+
+        self.status_dict.update(props)
+        self._status_dict_json_suffix = None
+        self._status_message_received = True
+
+    def _compute_next_status_flush_time(
+        self, status_update_interval: float, last_flush_attempted_at: float
+    ) -> float:
+        """
+        Return when pending status should be sent next. If the last attempt
+        was skipped or failed, wait at least the minimum request delay before
+        trying again.
+        """
+        last_sent_at = coalesce(self.last_update_sent_at, -math.inf)
+        next_flush_time = last_sent_at + status_update_interval
+
+        if last_flush_attempted_at > last_sent_at:
+            next_flush_time = max(
+                next_flush_time,
+                last_flush_attempted_at
+                + max(status_update_interval, self._MIN_HTTP_REQUEST_DELAY_SECONDS),
+            )
+
+        return next_flush_time
 
     def is_status_update_due(self) -> bool:
         return (self.last_update_sent_at is None) or (
             (self.params.status_update_interval is not None)
             and (
-                time.time() - self.last_update_sent_at
+                time.monotonic() - self.last_update_sent_at
                 > self.params.status_update_interval
             )
         )
 
     def _make_headers(self) -> Dict[str, str]:
-        headers = {
-            "Authorization": f"Bearer {self.params.api_key}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        """
+        Return the API request headers. The result is shared between
+        requests, so it must not be modified.
+        """
+        headers = self._api_headers
+
+        if headers is None:
+            headers = {
+                "Authorization": f"Bearer {self.params.api_key}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            }
+            self._api_headers = headers
+
         return headers
 
     def make_process_env(self) -> Dict[str, str]:
@@ -1680,29 +2187,40 @@ class ProcWrapper:
 
         should_send_runtime_metadata = self._should_send_runtime_metadata()
 
-        body = self._make_update_body(
-            status=status,
-            failed_attempts=failed_attempts,
-            timed_out_attempts=timed_out_attempts,
-            exit_code=exit_code,
-            pid=pid,
-            finished_at=finished_at,
-            output_value=output_value,
-            include_runtime_metadata=should_send_runtime_metadata,
-            extra_runtime_metadata=extra_props,
-        )
+        if (
+            (failed_attempts is None)
+            and (timed_out_attempts is None)
+            and (exit_code is None)
+            and (pid is None)
+            and (finished_at is None)
+            and (output_value is None)
+            and (not extra_props)
+            and (not should_send_runtime_metadata)
+            and ("status" not in self.status_dict)
+        ):
+            # Common case for heartbeats and status updates: splice the status
+            # into the pre-serialized status properties.
+            data = self._make_status_only_update_data(status)
+        else:
+            body = self._make_update_body(
+                status=status,
+                failed_attempts=failed_attempts,
+                timed_out_attempts=timed_out_attempts,
+                exit_code=exit_code,
+                pid=pid,
+                finished_at=finished_at,
+                output_value=output_value,
+                include_runtime_metadata=should_send_runtime_metadata,
+                extra_runtime_metadata=extra_props,
+            )
+            data = encode_json(body)
 
-        url = (
-            f"{self.params.api_base_url}/api/v1/task_executions/"
-            + quote_plus(str(self.task_execution_uuid))
-            + "/?content=false"
-        )
+        url = self._make_task_execution_url() + "?content=false"
         headers = self._make_headers()
-        text_data = json.dumps(body)
-        data = text_data.encode("utf-8")
         is_final_update = bool(status) and (status != self.STATUS_RUNNING)
 
-        _logger.debug(f"Sending update '{text_data}' ...")
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug("Sending update '%s' ...", data.decode("utf-8", "replace"))
 
         req = Request(url, data=data, headers=headers, method="PATCH")
         f = self._send_api_request(req, is_final_update=is_final_update)
@@ -1713,12 +2231,13 @@ class ProcWrapper:
         with f:
             _logger.info("Update sent successfully.")
 
-            current_time = time.time()
+            current_time = time.monotonic()
             self.last_update_sent_at = current_time
             if should_send_runtime_metadata:
                 self.runtime_metadata_last_sent_at = current_time
 
             self.status_dict = {}
+            self._status_dict_json_suffix = None
             self.reported_final_status = is_final_update
 
         return self._SEND_RESULT_SUCCESS
@@ -1737,6 +2256,37 @@ class ProcWrapper:
             )
         )
 
+    def _make_status_only_update_data(self, status: Optional[str]) -> bytes:
+        """
+        Return the encoded update body containing only the status and the
+        contents of status_dict. This is equivalent to encoding the result
+        of _make_update_body() without other arguments, but the encoding of
+        status_dict is cached until status_dict changes.
+        """
+        if self._status_dict_json_suffix is None:
+            status_props = self.status_dict
+            unsent_last_app_heartbeat_at = status_props.get(
+                self._STATUS_UPDATE_KEY_LAST_APP_HEARTBEAT_AT
+            )
+
+            if unsent_last_app_heartbeat_at:
+                status_props = dict(status_props)
+                status_props[
+                    self._STATUS_UPDATE_KEY_LAST_APP_HEARTBEAT_AT
+                ] = unsent_last_app_heartbeat_at.isoformat()
+
+            if status_props:
+                # Strip the opening brace, it is replaced by the status prefix
+                self._status_dict_json_suffix = b"," + encode_json(status_props)[1:]
+            else:
+                self._status_dict_json_suffix = b"}"
+
+        return (
+            b'{"status":'
+            + encode_json(status or self.STATUS_RUNNING)
+            + self._status_dict_json_suffix
+        )
+
     def _make_update_body(
         self,
         status: Optional[str] = None,
@@ -1822,14 +2372,18 @@ class ProcWrapper:
         req: Request,
         is_task_execution_creation_request: bool = False,
         is_final_update: bool = False,
-    ) -> Optional[RawIOBase]:
+    ) -> Optional[BinaryIO]:
         """
         Send an API request, with retries and error handling.
         """
 
-        _logger.debug(
-            f"Sending {req.method} request with body {str(req.data)} to {req.full_url} ...."
-        )
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug(
+                "Sending %s request with body %s to %s ....",
+                req.method,
+                req.data,
+                req.full_url,
+            )
 
         self._refresh_api_server_retries_exhausted()
 
@@ -1837,7 +2391,7 @@ class ProcWrapper:
             _logger.debug("Not sending API request because all retries are exhausted")
             return None
 
-        first_attempt_at = time.time()
+        first_attempt_at = time.monotonic()
         deadline = self._compute_successful_request_deadline(
             first_attempt_at=first_attempt_at,
             is_task_execution_creation_request=is_task_execution_creation_request,
@@ -1846,24 +2400,31 @@ class ProcWrapper:
 
         attempt_count = 0
 
-        api_request_data: Dict[str, Any] = {
-            "request": {
-                "url": req.full_url,
-                "method": req.method,
-                "body": str(req.data),
-            }
+        # The request body is only needed for error reporting, so it is
+        # decoded lazily by _populate_request_body() in the error branches.
+        request_data: Dict[str, Any] = {
+            "url": req.full_url,
+            "method": req.method,
         }
+        api_request_data: Dict[str, Any] = {"request": request_data}
+
+        # Reused across attempts, only one is included in api_request_data
+        response_data: Dict[str, Any] = {}
+        error_data: Dict[str, Any] = {}
 
         status_code: Optional[int] = None
+        now = first_attempt_at
 
-        while (deadline is None) or (time.time() < deadline):
+        while (deadline is None) or (now < deadline):
             attempt_count += 1
             retry_delay = self.params.api_retry_delay
 
-            _logger.info(f"Sending API request (attempt {attempt_count}) ...")
+            _logger.info("Sending API request (attempt %d) ...", attempt_count)
 
             try:
-                resp = urlopen(req, timeout=self.params.api_request_timeout)
+                resp = self._open_http_response(
+                    req, timeout=self.params.api_request_timeout
+                )
                 self.last_api_request_failed_at = None
                 self.last_api_request_data = None
 
@@ -1872,6 +2433,7 @@ class ProcWrapper:
 
                 return resp
             except HTTPError as http_error:
+                self._populate_request_body(request_data, req)
                 status_code = http_error.code
 
                 response_body = None
@@ -1882,10 +2444,9 @@ class ProcWrapper:
                     _logger.warning("Can't read error response body")
 
                 api_request_data.pop("error", None)
-                api_request_data["response"] = {
-                    "status_code": status_code,
-                    "body": response_body,
-                }
+                response_data["status_code"] = status_code
+                response_data["body"] = response_body
+                api_request_data["response"] = response_data
 
                 if status_code in self._RETRYABLE_HTTP_STATUS_CODES:
                     if not self.last_api_request_failed_at:
@@ -1896,12 +2457,17 @@ class ProcWrapper:
                             is_final_update=is_final_update,
                         )
 
-                    self.last_api_request_failed_at = time.time()
+                    self.last_api_request_failed_at = time.monotonic()
+
+                    retry_after = self._extract_retry_delay_seconds(http_error.headers)
+
+                    if retry_after is None:
+                        retry_delay = self._compute_backoff_delay(
+                            retry_delay, attempt_count
+                        )
+                    else:
+                        retry_delay = retry_after
 
-                    retry_delay = coalesce(
-                        self._extract_retry_delay_seconds(http_error.headers),
-                        retry_delay,
-                    )
                     retry_delay = min(
                         max(retry_delay, self._MIN_HTTP_REQUEST_DELAY_SECONDS),
                         self._MAX_HTTP_REQUEST_DELAY_SECONDS,
@@ -1927,7 +2493,7 @@ class ProcWrapper:
                             "Got response code = 409 during Task Execution creation"
                         )
                     else:
-                        self.last_api_request_failed_at = time.time()
+                        self.last_api_request_failed_at = time.monotonic()
                         _logger.error(
                             "Got response code 409 after Task Execution started, exiting."
                         )
@@ -1938,14 +2504,15 @@ class ProcWrapper:
                         self._exit_or_raise(exit_code)
                         return None
                 else:
-                    self.last_api_request_failed_at = time.time()
+                    self.last_api_request_failed_at = time.monotonic()
 
                     error_message = f"Got error response code = {status_code}, body = '{response_body}'"
                     self._report_error(error_message, api_request_data)
 
                     if self.params.prevent_offline_execution:
                         _logger.critical(
-                            f"Response code = {status_code}, exiting since we are preventing offline execution."
+                            "Response code = %s, exiting since we are preventing offline execution.",
+                            status_code,
                         )
                         self.last_api_request_data = api_request_data
                         exit_code = self._RESPONSE_CODE_TO_EXIT_CODE.get(
@@ -1955,10 +2522,13 @@ class ProcWrapper:
                         return None
 
                     _logger.warning(
-                        f"Response code = {status_code}, but continuing since we are allowing offline execution."
+                        "Response code = %s, but continuing since we are allowing offline execution.",
+                        status_code,
                     )
                     return None
             except Exception as ex:
+                self._populate_request_body(request_data, req)
+
                 if not self.last_api_request_failed_at:
                     deadline = self._compute_successful_request_deadline(
                         first_attempt_at=first_attempt_at,
@@ -1967,24 +2537,32 @@ class ProcWrapper:
                         is_final_update=is_final_update,
                     )
 
-                self.last_api_request_failed_at = time.time()
+                self.last_api_request_failed_at = time.monotonic()
 
                 api_request_data.pop("response", None)
 
+                retry_delay = self._compute_backoff_delay(retry_delay, attempt_count)
+
                 if isinstance(ex, URLError):
                     error_message = f"URL error: {ex}"
-                    api_request_data["error"] = {"reason": str(ex.reason)}
+                    error_data["reason"] = str(ex.reason)
+                    api_request_data["error"] = error_data
                 else:
                     error_message = f"Unhandled exception: {ex}"
 
                 self._report_error(error_message, api_request_data)
 
-            if (deadline is None) or (time.time() < deadline):
-                _logger.debug(f"Sleeping {retry_delay} seconds after request error ...")
+            now = time.monotonic()
+            if (deadline is None) or (now < deadline):
+                _logger.debug(
+                    "Sleeping %s seconds after request error ...", retry_delay
+                )
                 time.sleep(retry_delay)
                 _logger.debug("Done sleeping after request error.")
+                now = time.monotonic()
 
         self.api_server_retries_exhausted = True
+        self._populate_request_body(request_data, req)
 
         if is_task_execution_creation_request and (
             self.params.prevent_offline_execution or self.was_conflict
@@ -2003,6 +2581,172 @@ class ProcWrapper:
         )
         return None
 
+    def _open_http_response(
+        self,
+        req: Request,
+        timeout: Optional[float],
+        max_response_bytes: Optional[int] = None,
+    ) -> BinaryIO:
+        """
+        Send a request using a connection to the host that is kept open
+        between requests, and return the response. Like urlopen(), follow
+        redirects, raise HTTPError for error responses and URLError if the
+        request can't be sent.
+
+        If max_response_bytes is set, at most one more byte than that is read
+        from the response body, so the caller can tell it was truncated.
+        """
+        redirect_handler = HTTPRedirectHandler()
+
+        for _ in range(redirect_handler.max_redirections + 1):
+            # Leave proxy handling to urllib
+            if getproxies().get(req.type) and not proxy_bypass(req.host):
+                return urlopen(req, timeout=timeout)
+
+            resp, body = self._send_http_request(
+                req, timeout=timeout, max_response_bytes=max_response_bytes
+            )
+
+            if not (200 <= resp.status < 300):
+                fp = BytesIO(body)
+                location = resp.headers.get("Location") or resp.headers.get("URI")
+
+                if (resp.status in self._HTTP_REDIRECT_STATUS_CODES) and location:
+                    new_url = urljoin(req.full_url, location)
+
+                    if urlparse(new_url).scheme in ("http", "https"):
+                        # Raises HTTPError if the redirect can't be followed
+                        # for this method, just like urlopen()
+                        new_req = redirect_handler.redirect_request(
+                            req, fp, resp.status, resp.reason, resp.headers, new_url
+                        )
+
+                        if new_req is not None:
+                            req = new_req
+                            continue
+
+                raise HTTPError(
+                    req.full_url, resp.status, resp.reason, resp.headers, fp
+                )
+
+            return BytesIO(body)
+
+        raise HTTPError(
+            req.full_url,
+            resp.status,
+            HTTPRedirectHandler.inf_msg + resp.reason,
+            resp.headers,
+            BytesIO(body),
+        )
+
+    def _send_http_request(
+        self, req: Request, timeout: Optional[float], max_response_bytes: Optional[int]
+    ) -> Tuple[HTTPResponse, bytes]:
+        scheme = req.type
+        host = req.host
+        method = req.get_method()
+        key = (scheme, host)
+        headers = dict(req.header_items())
+
+        # urlopen() adds this header, but http.client doesn't
+        headers.setdefault("User-agent", self._HTTP_USER_AGENT)
+
+        while True:
+            conn = self._http_connections.get(key)
+            reused = conn is not None
+
+            if conn is None:
+                connection_class = (
+                    HTTPSConnection if scheme == "https" else HTTPConnection
+                )
+                conn = connection_class(host, timeout=timeout)
+                self._http_connections[key] = conn
+            else:
+                conn.timeout = timeout
+                if conn.sock:
+                    conn.sock.settimeout(timeout)
+
+            try:
+                conn.request(method, req.selector, body=req.data, headers=headers)
+                resp = conn.getresponse()
+            except (ConnectionResetError, BrokenPipeError) as ex:
+                self._close_http_connection(key)
+
+                # The server may have closed the idle connection, so retry
+                # once with a new one if nothing was received. A reset may
+                # come after the server processed the request, so only retry
+                # then if the request can safely be repeated. Anything else
+                # is left to the caller's retry logic.
+                if reused and (
+                    isinstance(ex, (RemoteDisconnected, BrokenPipeError))
+                    or (method in self._IDEMPOTENT_HTTP_METHODS)
+                ):
+                    _logger.debug("Connection to %s was closed, reconnecting ...", host)
+                    continue
+
+                raise URLError(ex)
+            except (OSError, HTTPException) as ex:
+                self._close_http_connection(key)
+                raise URLError(ex)
+
+            try:
+                if max_response_bytes is None:
+                    body = resp.read()
+                else:
+                    body = resp.read(max_response_bytes + 1)
+            except (OSError, HTTPException) as ex:
+                # Never retried, since the server already responded
+                self._close_http_connection(key)
+                raise URLError(ex)
+
+            # Also close the connection if the rest of a truncated body is
+            # still unread, since it can't be reused
+            if resp.will_close or (
+                (max_response_bytes is not None) and (len(body) > max_response_bytes)
+            ):
+                self._close_http_connection(key)
+
+            return resp, body
+
+    def _close_http_connection(self, key: Tuple[str, str]) -> None:
+        conn = self._http_connections.pop(key, None)
+
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                _logger.debug("Failed to close connection to %s", key[1], exc_info=True)
+
+    def _close_http_connections(self) -> None:
+        for key in list(self._http_connections):
+            self._close_http_connection(key)
+
+    @staticmethod
+    def _populate_request_body(request_data: Dict[str, Any], req: Request) -> None:
+        if "body" in request_data:
+            return
+
+        data = req.data
+        if isinstance(data, (bytes, bytearray)):
+            request_data["body"] = data.decode("utf-8", "replace")
+        else:
+            request_data["body"] = "" if data is None else str(data)
+
+    @classmethod
+    def _compute_backoff_delay(cls, base_delay: float, attempt_count: int) -> float:
+        """
+        Return the delay before retrying after the given attempt. The delay
+        doubles with each attempt, up to a maximum, and is randomized so that
+        wrappers that failed at the same time don't retry at the same time.
+        """
+        backoff = min(
+            base_delay * (2 ** min(attempt_count - 1, 16)),
+            cls._MAX_HTTP_REQUEST_DELAY_SECONDS,
+        )
+        return random.uniform(
+            min(cls._MIN_HTTP_REQUEST_DELAY_SECONDS, backoff), backoff
+        )
+
     @staticmethod
     def _extract_retry_delay_seconds(headers) -> Optional[float]:
         retry_after = headers.get("Retry-After")
@@ -2018,13 +2762,16 @@ class ProcWrapper:
                     ).total_seconds()
                 except Exception:
                     _logger.warning(
-                        f"Can't parse Retry-After header value '{retry_after}'",
+                        "Can't parse Retry-After header value '%s'",
+                        retry_after,
                         exc_info=True,
                     )
                     return None
 
             _logger.info(
-                f"Computed retry delay {retry_delay} from Retry-After header {retry_after}"
+                "Computed retry delay %s from Retry-After header %s",
+                retry_delay,
+                retry_after,
             )
             return retry_delay
 
@@ -2037,11 +2784,12 @@ class ProcWrapper:
         if self.last_api_request_failed_at is None:
             self.api_server_retries_exhausted = False
         else:
-            elapsed_time = time.time() - self.last_api_request_failed_at
+            elapsed_time = time.monotonic() - self.last_api_request_failed_at
 
             if elapsed_time > self.params.api_resume_delay:
                 _logger.info(
-                    f"Resuming API requests after {int(elapsed_time)} seconds after the last bad request"
+                    "Resuming API requests after %d seconds after the last bad request",
+                    elapsed_time,
                 )
                 self.api_server_retries_exhausted = False
 
@@ -2062,7 +2810,13 @@ class ProcWrapper:
 
         format += "%(levelname)s: %(message)s"
 
-        formatter = logging.Formatter(format)
+        # Reuse the formatter while the format is unchanged, so handlers that
+        # already use it are left alone
+        formatter = self._log_formatter
+        if (formatter is None) or (formatter._fmt != format):
+            formatter = logging.Formatter(format)
+            self._log_formatter = formatter
+
         logger_to_configure = _logger
 
         if not self.params.embedded_mode:
@@ -2070,6 +2824,9 @@ class ProcWrapper:
             logger_to_configure = logging.getLogger()
 
         for handler in logger_to_configure.handlers:
+            if handler.formatter is formatter:
+                continue
+
             try:
                 handler.setFormatter(formatter)
             except Exception:
@@ -2081,34 +2838,66 @@ class ProcWrapper:
                 f"Raising an error in embedded mode, exit code {exit_code}"
             )
 
-        if self.in_pytest:
-            self.handle_exit()
-        else:
-            if self.called_exit:
-                raise RuntimeError(
-                    f"exit() called already; raising exception instead of exiting with exit code {exit_code}"
-                )
+        self._exit_func(exit_code)
+        return exit_code
+
+    def _exit_process(self, exit_code: int) -> None:
+        if self.called_exit:
+            raise RuntimeError(
+                f"exit() called already; raising exception instead of exiting with exit code {exit_code}"
+            )
 
-            sys.exit(exit_code)
+        sys.exit(exit_code)
 
-        return exit_code
+    def _handle_exit_in_pytest(self, exit_code: int) -> None:
+        self.handle_exit()
 
     def _report_error(self, message: str, data: Optional[Dict[str, Any]]) -> None:
         _logger.error(message)
 
-        if self.params.rollbar_access_token:
+        if self.params.rollbar_access_token and not self._is_recent_error_report(
+            message
+        ):
             self._send_rollbar_error(message, data)
 
+    def _is_recent_error_report(self, message: str) -> bool:
+        """
+        Return True if the message was already reported recently. Otherwise,
+        record it as reported now and return False.
+        """
+        recent = self._recent_error_reports
+        now = time.monotonic()
+        expired_at = now - self._ERROR_REPORT_DEDUPLICATION_SECONDS
+
+        # Entries are in order of when they were reported, so expired entries
+        # are at the front
+        while recent:
+            old_message, reported_at = next(iter(recent.items()))
+
+            if (reported_at > expired_at) and (
+                len(recent) < self._MAX_RECENT_ERROR_REPORTS
+            ):
+                break
+
+            del recent[old_message]
+
+        if message in recent:
+            _logger.debug("Not sending recently reported error to Rollbar")
+            return True
+
+        recent[message] = now
+        return False
+
     def _send_rollbar_error(self, message: str, data=None, level="error") -> bool:
         if not self.params.rollbar_access_token:
             _logger.warning(
-                f"Not sending '{message}' to Rollbar since no access token found"
+                "Not sending '%s' to Rollbar since no access token found", message
             )
             return False
 
-        if self.rollbar_retries_exhausted:
+        if self._refresh_rollbar_retries_exhausted():
             _logger.debug(
-                f"Not sending '{message}' to Rollbar since all retries are exhausted"
+                "Not sending '%s' to Rollbar since all retries are exhausted", message
             )
             return False
 
@@ -2143,7 +2932,7 @@ class ProcWrapper:
             },
         }
 
-        request_body = json.dumps(payload).encode("utf-8")
+        request_body = encode_json(payload)
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
@@ -2165,34 +2954,105 @@ class ProcWrapper:
 
         while (max_attempts < 0) or (attempt_count < max_attempts):
             attempt_count += 1
+            retry_delay: Optional[float] = None
 
             _logger.info(
-                f"Sending Rollbar request attempt {attempt_count}/{max_attempts}) ..."
+                "Sending Rollbar request attempt %d/%d) ...",
+                attempt_count,
+                max_attempts,
             )
 
             try:
-                with urlopen(req, timeout=self.params.rollbar_timeout) as f:
-                    response_body = f.read().decode("utf-8")
-                    _logger.debug(f"Got Rollbar response '{response_body}'")
+                with self._open_http_response(
+                    req,
+                    timeout=self.params.rollbar_timeout,
+                    max_response_bytes=self._MAX_ROLLBAR_RESPONSE_BYTES,
+                ) as f:
+                    response_bytes = f.read(self._MAX_ROLLBAR_RESPONSE_BYTES + 1)
+
+                    if len(response_bytes) > self._MAX_ROLLBAR_RESPONSE_BYTES:
+                        _logger.warning(
+                            "Rollbar response exceeded %d bytes, not reading the rest",
+                            self._MAX_ROLLBAR_RESPONSE_BYTES,
+                        )
+                        return True
 
-                    response_dict = json.loads(response_body)
-                    uuid = response_dict["result"]["uuid"]
+                    # The response is only used for logging
+                    if _logger.isEnabledFor(logging.DEBUG):
+                        _logger.debug(
+                            "Got Rollbar response '%s'",
+                            response_bytes.decode("utf-8", "replace"),
+                        )
 
-                    _logger.debug(f"Rollbar request returned UUID {uuid}.")
+                        try:
+                            uuid = decode_json(response_bytes)["result"]["uuid"]
+                            _logger.debug("Rollbar request returned UUID %s.", uuid)
+                        except (ValueError, LookupError, TypeError):
+                            _logger.debug("Can't get UUID from Rollbar response")
 
                     return True
             except HTTPError as http_error:
                 status_code = http_error.code
-                _logger.critical(f"Rollbar response code = {status_code}, giving up.")
-                return False
+
+                if status_code not in self._RETRYABLE_HTTP_STATUS_CODES:
+                    _logger.critical(
+                        "Rollbar response code = %s, giving up.", status_code
+                    )
+                    return False
+
+                _logger.error(
+                    "Rollbar temporarily not available, status code = %s", status_code
+                )
+                retry_delay = self._extract_retry_delay_seconds(http_error.headers)
             except URLError as url_error:
-                _logger.error(f"Rollbar URL error: {url_error}")
+                _logger.error("Rollbar URL error: %s", url_error)
+
+            if (max_attempts >= 0) and (attempt_count >= max_attempts):
+                break
+
+            if retry_delay is None:
+                if not self.params.rollbar_retry_delay:
+                    continue
+
+                retry_delay = self._compute_backoff_delay(
+                    self.params.rollbar_retry_delay, attempt_count
+                )
+            else:
+                retry_delay = min(
+                    max(retry_delay, 0.0), self._MAX_HTTP_REQUEST_DELAY_SECONDS
+                )
 
-                if self.params.rollbar_retry_delay:
-                    _logger.debug("Sleeping after Rollbar request error ...")
-                    time.sleep(self.params.rollbar_retry_delay)
-                    _logger.debug("Done sleeping after Rollbar request error.")
+            _logger.debug(
+                "Sleeping %.1f seconds after Rollbar request error ...", retry_delay
+            )
+            time.sleep(retry_delay)
+            _logger.debug("Done sleeping after Rollbar request error.")
 
         self.rollbar_retries_exhausted = True
+        self._rollbar_retries_exhausted_at = time.monotonic()
         _logger.error("Exhausted all retries, giving up.")
         return False
+
+    def _refresh_rollbar_retries_exhausted(self) -> bool:
+        if not self.rollbar_retries_exhausted:
+            return False
+
+        resume_delay = self.params.rollbar_resume_delay
+
+        # None or a negative value means to never resume
+        if (
+            (resume_delay is not None)
+            and (resume_delay >= 0)
+            and (self._rollbar_retries_exhausted_at is not None)
+        ):
+            elapsed_time = time.monotonic() - self._rollbar_retries_exhausted_at
+
+            if elapsed_time > resume_delay:
+                _logger.info(
+                    "Resuming Rollbar requests %d seconds after retries were exhausted",
+                    elapsed_time,
+                )
+                self.rollbar_retries_exhausted = False
+                self._rollbar_retries_exhausted_at = None
+
+        return self.rollbar_retries_exhausted
@@ -99,6 +99,7 @@ IMMUTABLE_PROPERTIES_COPIED_FROM_CONFIG = [
     "enable_status_update_listener",
     "status_update_socket_port",
     "status_update_message_max_bytes",
+    "status_update_length_prefixed",
     "status_update_interval",
     "log_level",
     "include_timestamps_in_log",
@@ -135,6 +136,7 @@ PROPERTIES_COPIED_FROM_ROLLBAR_CONFIG = [
     "access_token",
     "retries",
     "retry_delay",
+    "resume_delay",
     "timeout",
 ]
 
@@ -149,6 +151,7 @@ DEFAULT_STATUS_UPDATE_MESSAGE_MAX_BYTES = 64 * 1024
 DEFAULT_ROLLBAR_TIMEOUT_SECONDS = 30
 DEFAULT_ROLLBAR_RETRIES = 2
 DEFAULT_ROLLBAR_RETRY_DELAY_SECONDS = 120
+DEFAULT_ROLLBAR_RESUME_DELAY_SECONDS = 600
 
 DEFAULT_PROCESS_CHECK_INTERVAL_SECONDS = 10
 DEFAULT_PROCESS_RETRY_DELAY_SECONDS = 60
@@ -518,6 +521,7 @@ class ProcWrapperParams(ConfigResolverParams):
         self.status_update_message_max_bytes: int = (
             DEFAULT_STATUS_UPDATE_MESSAGE_MAX_BYTES
         )
+        self.status_update_length_prefixed: bool = False
         self.status_update_interval: Optional[int] = None
 
         self.log_level = DEFAULT_LOG_LEVEL
@@ -530,6 +534,7 @@ class ProcWrapperParams(ConfigResolverParams):
         self.rollbar_access_token: Optional[str] = None
         self.rollbar_retries: Optional[int] = DEFAULT_ROLLBAR_RETRIES
         self.rollbar_retry_delay: int = DEFAULT_ROLLBAR_RETRY_DELAY_SECONDS
+        self.rollbar_resume_delay: Optional[int] = DEFAULT_ROLLBAR_RESUME_DELAY_SECONDS
         self.rollbar_timeout: int = DEFAULT_ROLLBAR_TIMEOUT_SECONDS
 
         if override_env is not None:
@@ -978,6 +983,7 @@ class ProcWrapperParams(ConfigResolverParams):
             _logger.debug(f"Rollbar timeout = {self.rollbar_timeout}")
             _logger.debug(f"Rollbar retries = {self.rollbar_retries}")
             _logger.debug(f"Rollbar retry delay = {self.rollbar_retry_delay}")
+            _logger.debug(f"Rollbar resume delay = {self.rollbar_resume_delay}")
         else:
             _logger.debug("Rollbar is disabled")
 
@@ -995,6 +1001,9 @@ class ProcWrapperParams(ConfigResolverParams):
                 _logger.debug(
                     f"Status update message max bytes = {self.status_update_message_max_bytes}"
                 )
+                _logger.debug(
+                    f"Status update length prefixed = {self.status_update_length_prefixed}"
+                )
 
         _logger.debug(f"Status update interval = {self.status_update_interval}")
 
@@ -1041,6 +1050,9 @@ class ProcWrapperParams(ConfigResolverParams):
                 env["PROC_WRAPPER_STATUS_UPDATE_MESSAGE_MAX_BYTES"] = str(
                     self.status_update_message_max_bytes
                 )
+                env["PROC_WRAPPER_STATUS_UPDATE_LENGTH_PREFIXED"] = str(
+                    self.status_update_length_prefixed
+                ).upper()
 
             if self.task_execution_uuid:
                 env["PROC_WRAPPER_TASK_EXECUTION_UUID"] = self.task_execution_uuid
@@ -1058,6 +1070,9 @@ class ProcWrapperParams(ConfigResolverParams):
             env["PROC_WRAPPER_ROLLBAR_RETRY_DELAY_SECONDS"] = str(
                 self.rollbar_retry_delay
             )
+            env["PROC_WRAPPER_ROLLBAR_RESUME_DELAY_SECONDS"] = str(
+                encode_int(self.rollbar_resume_delay, empty_value=-1)
+            )
 
         if self.task_version_number is not None:
             env["PROC_WRAPPER_TASK_VERSION_NUMBER"] = str(self.task_version_number)
@@ -1295,6 +1310,14 @@ class ProcWrapperParams(ConfigResolverParams):
                 or self.status_update_message_max_bytes
             )
 
+            self.status_update_length_prefixed = (
+                string_to_bool(
+                    env.get("PROC_WRAPPER_STATUS_UPDATE_LENGTH_PREFIXED"),
+                    default_value=self.status_update_length_prefixed,
+                )
+                or False
+            )
+
     def _override_proc_wrapper_params_from_task_dict(
         self, task: Dict[str, Any]
     ) -> None:
@@ -1353,6 +1376,12 @@ class ProcWrapperParams(ConfigResolverParams):
                 self.rollbar_retry_delay,
             )
 
+            # A negative value means to never resume
+            self.rollbar_resume_delay = string_to_int(
+                env.get("PROC_WRAPPER_ROLLBAR_RESUME_DELAY_SECONDS"),
+                default_value=self.rollbar_resume_delay,
+            )
+
             self.rollbar_timeout = coalesce(
                 string_to_int(
                     env.get("PROC_WRAPPER_ROLLBAR_TIMEOUT_SECONDS"),
@@ -1775,8 +1804,9 @@ when sending the final update before exiting. Defaults to
         "--api-retry-delay",
         default=DEFAULT_API_FINAL_UPDATE_TIMEOUT_SECONDS,
         help=f"""
-Number of seconds to wait before retrying an API request.
-Defaults to {DEFAULT_API_RETRY_DELAY_SECONDS}.""",
+Base number of seconds to wait before retrying an API request. The delay
+doubles with each retry, up to 600 seconds, and is randomized to spread out
+retries. Defaults to {DEFAULT_API_RETRY_DELAY_SECONDS}.""",
     )
     api_group.add_argument(
         "--api-resume-delay",
@@ -2025,6 +2055,13 @@ Defaults to {DEFAULT_STATUS_UPDATE_SOCKET_PORT}.""",
         help=f"""
 The maximum number of bytes status update messages can be. Defaults to
 {DEFAULT_STATUS_UPDATE_MESSAGE_MAX_BYTES}.""",
+    )
+    update_group.add_argument(
+        "--status-update-length-prefixed",
+        action="store_true",
+        help="""
+Expect each status update message to be prefixed with its length as a 4-byte
+big-endian unsigned integer, instead of being terminated by a newline.""",
     )
     update_group.add_argument(
         "--status-update-interval",
@@ -2186,8 +2223,18 @@ Defaults to {DEFAULT_ROLLBAR_RETRIES}.""",
         "--rollbar-retry-delay",
         default=DEFAULT_ROLLBAR_RETRY_DELAY_SECONDS,
         help=f"""
-Number of seconds to wait before retrying a Rollbar request. Defaults to
-{DEFAULT_ROLLBAR_RETRY_DELAY_SECONDS}.""",
+Base number of seconds to wait before retrying a Rollbar request. The delay
+doubles with each retry, up to 600 seconds, and is randomized to spread out
+retries. Defaults to {DEFAULT_ROLLBAR_RETRY_DELAY_SECONDS}.""",
+    )
+    rollbar_group.add_argument(
+        "--rollbar-resume-delay",
+        type=int,
+        default=DEFAULT_ROLLBAR_RESUME_DELAY_SECONDS,
+        help=f"""
+Number of seconds to wait before resuming Rollbar requests, after retries are
+exhausted. Defaults to {DEFAULT_ROLLBAR_RESUME_DELAY_SECONDS}.
+-1 means to never resume.""",
     )
     rollbar_group.add_argument(
         "--rollbar-timeout",
@@ -1,7 +1,6 @@
 import copy
 import json
 import logging
-import platform
 import re
 from dataclasses import dataclass
 from datetime import datetime
@@ -974,6 +973,9 @@ class GenericRuntimeMetadataFetcher(RuntimeMetadataFetcher):
     def fetch(
         self, env: Mapping[str, str], context: Optional[Any] = None
     ) -> Optional[RuntimeMetadata]:
+        # Only needed as a fallback, so avoid the import cost otherwise
+        import platform
+
         host_names: List[str] = []
 
         uname = platform.uname()
@@ -25,6 +25,7 @@ import json
 import logging
 import os
 import socket
+import struct
 from typing import Any, Dict, Optional
 
 
@@ -60,6 +61,13 @@ class StatusUpdater:
             or StatusUpdater.DEFAULT_STATUS_UPDATE_PORT
         )
 
+        self.length_prefixed = (
+            os.environ.get("PROC_WRAPPER_STATUS_UPDATE_LENGTH_PREFIXED", "FALSE")
+            .strip()
+            .upper()
+            == "TRUE"
+        )
+
         self.incremental_count_mode = incremental_count_mode
         self.success_count = 0
         self.error_count = 0
@@ -144,7 +152,11 @@ class StatusUpdater:
         if not status_hash:
             return
 
-        message = (json.dumps(status_hash) + "\n").encode("UTF-8")
+        if self.length_prefixed:
+            payload = json.dumps(status_hash).encode("UTF-8")
+            message = struct.pack(">I", len(payload)) + payload
+        else:
+            message = (json.dumps(status_hash) + "\n").encode("UTF-8")
 
         try:
             self.reuse_or_create_socket().sendto(message, ("127.0.0.1", self.port))